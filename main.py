@@ -2,15 +2,26 @@
 A simple command-line app for SIPD-RI tasks by Odhy Pradhana
 """
 
+from src.bot_sipd import BrowserPool
 from src.helper_main import run_app
+from src.utils import setup_logging
 
 
 def main():
     """
     The entry point of the program.
-    Calls the `run_app` function to initialize the application's main menu.
+    Sets up background logging, then calls the `run_app` function to initialize the
+    application's main menu. The pooled browser is shut down on exit.
     """
-    run_app()
+    listener = setup_logging()
+    try:
+        run_app()
+    finally:
+        try:
+            BrowserPool.shutdown()
+        finally:
+            # Flush pending records even if the shutdown fails, they may explain why
+            listener.stop()
 
 
 if __name__ == "__main__":
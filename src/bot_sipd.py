@@ -3,12 +3,163 @@ A module for automating interactions with SIPD-RI Kemendagri Website.
 """
 
 import os
+import re
 import time
-import json
+import logging
+from collections import deque
+from datetime import datetime
+from pathlib import Path
 
-from src.utils import get_month_name
+from src.utils import get_month_name, prompt, validate_month_range
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+import orjson
+from playwright.sync_api import (
+    sync_playwright,
+    Error as PlaywrightError,
+    TimeoutError as PlaywrightTimeoutError,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Indonesian month names, indexed by `month - 1`
+_MONTHS = tuple(get_month_name(i) for i in range(1, 13))
+
+
+class DownloadFailed(Exception):
+    """
+    Raised when a download still fails after every retry attempt.
+    """
+
+
+class DownloadInterrupted(Exception):
+    """
+    Raised when the browser reports a download as failed or canceled.
+    """
+
+
+def _is_retriable(error: Exception) -> bool:
+    """
+    Checks if a download error is transient and worth another attempt.
+
+    Timeouts, interrupted downloads, and Playwright network errors (`net::ERR_*`) are
+    retriable. Anything else is a bug or a changed page.
+
+    Args:
+        error (Exception): The error raised while downloading.
+
+    Returns:
+        bool: True if the download should be retried, False otherwise.
+    """
+    if isinstance(error, (PlaywrightTimeoutError, DownloadInterrupted)):
+        return True
+    return isinstance(error, PlaywrightError) and "net::ERR_" in error.message
+
+
+class _DownloadAborted(Exception):
+    """
+    Raised once an unexpected download error has been logged, to stop the run without
+    logging it again.
+    """
+
+
+class LoginRequired(Exception):
+    """
+    Raised when a headless session would need the user to log in by hand.
+    """
+
+
+class BrowserPool:
+    """
+    Keeps Chromium running between `SIPDBot` sessions, so only the first session of the
+    program pays for starting Playwright and launching the browser.
+
+    Each session gets its own browser context, which is closed on release while the
+    browser stays warm. One browser is kept per mode (headless and debug).
+    """
+
+    # Chromium flags for headless runs, skipping GPU work and first-run setup
+    HEADLESS_ARGS = [
+        "--no-zygote",
+        "--disable-gpu",
+        "--disable-dev-shm-usage",
+        "--disable-accelerated-2d-canvas",
+        "--disable-popup-blocking",
+        "--no-first-run",
+    ]
+
+    _playwright = None
+    _browsers = {}
+
+    @classmethod
+    def get_browser(cls, debug=False):
+        """
+        Returns the pooled browser for the given mode, launching it on first use.
+
+        A pooled browser that has been closed or has crashed is launched again.
+
+        Args:
+            debug (bool, optional): Use the visible, maximized browser instead of the
+            headless one. Defaults to False.
+
+        Returns:
+            Browser: The Playwright browser instance.
+        """
+        if cls._playwright is None:
+            cls._playwright = sync_playwright().start()
+
+        browser = cls._browsers.get(debug)
+        if browser is None or not browser.is_connected():
+            if debug:
+                cls._browsers[debug] = cls._playwright.chromium.launch(
+                    headless=False, args=["--start-maximized"]
+                )
+            else:
+                cls._browsers[debug] = cls._playwright.chromium.launch(
+                    headless=True, args=cls.HEADLESS_ARGS
+                )
+
+        return cls._browsers[debug]
+
+    @classmethod
+    def acquire(cls, debug=False, **context_options):
+        """
+        Creates a fresh browser context and page on the pooled browser.
+
+        Args:
+            debug (bool, optional): Use the visible, maximized browser instead of the
+            headless one. Defaults to False.
+            **context_options: Options passed on to `Browser.new_context`.
+
+        Returns:
+            tuple: The new browser context and its page.
+        """
+        context = cls.get_browser(debug).new_context(**context_options)
+        return context, context.new_page()
+
+    @staticmethod
+    def release(context):
+        """
+        Closes a browser context handed out by `acquire`, keeping the browser running.
+
+        Args:
+            context (BrowserContext): The browser context to close.
+        """
+        context.close()
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Closes every pooled browser and stops Playwright. Call this on program exit.
+        """
+        for browser in cls._browsers.values():
+            if browser.is_connected():
+                browser.close()
+        cls._browsers.clear()
+
+        if cls._playwright is not None:
+            cls._playwright.stop()
+            cls._playwright = None
 
 
 class SIPDBot:
@@ -24,17 +175,55 @@ class SIPDBot:
     URL_PENATAUSAHAAN = "https://sipd.kemendagri.go.id/penatausahaan"
     URL_AKLAP = "https://sipd.kemendagri.go.id/penatausahaan/aklap"
     URL_AKLAPV2 = "https://peta.sipd.kemendagri.go.id/aklapv2"
-
-    def __init__(self):
+    URL_REALISASI = URL_PENATAUSAHAAN + "/penatausahaan/pengeluaran/laporan/realisasi"
+
+    # Saved login session, holding cookies and local storage
+    STATE_FILE = "state.json"
+    # Session file of older versions, which only held the cookies
+    LEGACY_COOKIE_FILE = "cookies.json"
+    # Time for the loaded login page to redirect to the dashboard before the saved
+    # session counts as expired
+    SESSION_CHECK_TIMEOUT = 30_000
+
+    # Maximum number of tabs downloading `Laporan Realisasi` at the same time
+    DOWNLOAD_CONCURRENCY = 4
+    # Number of retries for a failed month, with exponential backoff between them
+    DOWNLOAD_RETRIES = 3
+    # Number of batches before the browser context is recycled. A batch downloads up
+    # to `DOWNLOAD_CONCURRENCY` months, so the context is swapped every 8 months at
+    # most and a full year run pays for one recycle only.
+    CONTEXT_RECYCLE_BATCHES = 2
+
+    HEADLESS_VIEWPORT = {"width": 1280, "height": 800}
+
+    # Image, font and media files, never needed to fill forms or download reports. The
+    # optional query string covers cache-busted URLs such as `logo.png?v=3`.
+    BLOCKED_RESOURCE_PATTERN = re.compile(
+        r"\.(png|jpe?g|gif|svg|webp|ico|woff2?|ttf|otf|eot|mp4|webm)(\?|$)"
+    )
+
+    def __init__(self, captcha_solver=None, debug=False):
+        """
+        Args:
+            captcha_solver (callable, optional): A function that receives the login page and
+            solves its CAPTCHA. When omitted, the CAPTCHA is left to the user. Defaults to
+            None.
+            debug (bool, optional): Launch a visible, maximized browser. Needed whenever the
+            user has to interact with the page, such as a manual login. Defaults to False.
+        """
+        self.captcha_solver = captcha_solver
+        self.debug = debug
         self.browser = None
         self.context = None
         self.page = None
-        self.playwright = None
 
     def __enter__(self):
         """
         Initializes the browser and page when entering the context.
 
+        The browser itself comes from `BrowserPool`, so it is only launched by the first
+        session and reused afterwards.
+
         Attributes:
             self.browser (Browser): The Playwright browser instance.
             self.context (BrowserContext): The context for managing browser settings and cookies.
@@ -42,29 +231,76 @@ class SIPDBot:
                               interaction.
 
         Notes:
-            - The browser is launched in non-headless mode (`headless=False`) to allow visual
-              debugging.
-            - The `--start-maximized` argument ensures the browser opens in maximized mode.
-            - A universal viewport is disabled using `no_viewport=True`.
-        """
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=False, args=["--start-maximized"]
-        )
-        self.context = self.browser.new_context(no_viewport=True)
-        self.page = self.context.new_page()
+            - By default the browser is launched headless with `BrowserPool.HEADLESS_ARGS`
+              and a fixed `HEADLESS_VIEWPORT`.
+            - In debug mode the browser is launched in non-headless mode (`headless=False`),
+              maximized with `--start-maximized`, and with the viewport disabled using
+              `no_viewport=True`.
+        """
+        self.browser = BrowserPool.get_browser(self.debug)
+        self._new_context()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         """
-        Closes the browser and cleans up resources when exiting the context.
+        Closes the browser context when exiting the context. The browser is left running
+        in `BrowserPool` for the next session.
         """
         if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+            BrowserPool.release(self.context)
+
+    def _new_context(self, storage_state=None):
+        """
+        Creates a fresh browser context and its main page.
+
+        Navigations time out after 15 seconds by default, other actions after 30 seconds.
+        Calls that expect a slow page pass their own timeout.
+
+        Args:
+            storage_state (dict, optional): Cookies and local storage to restore into the
+            new context. Defaults to None.
+        """
+        if self.debug:
+            self.context, self.page = BrowserPool.acquire(
+                self.debug, no_viewport=True, storage_state=storage_state
+            )
+        else:
+            self.context, self.page = BrowserPool.acquire(
+                self.debug, viewport=self.HEADLESS_VIEWPORT, storage_state=storage_state
+            )
+
+        self.context.set_default_navigation_timeout(15_000)
+        self.context.set_default_timeout(30_000)
+
+        # The CAPTCHA is an image, so keep images whenever one might need solving
+        if not self.debug and not self.captcha_solver:
+            self.context.route(self.BLOCKED_RESOURCE_PATTERN, self._block_resources)
+
+    def _block_resources(self, route):
+        """
+        Route handler that aborts requests matching `BLOCKED_RESOURCE_PATTERN`.
+
+        Only those file URLs are intercepted, so scripts, stylesheets and API calls go
+        straight to the network without a round trip through Python. It is registered
+        once per browser context, not per page, so the handler does not pile up as tabs
+        are opened.
+
+        Args:
+            route (Route): The intercepted request route.
+        """
+        route.abort()
+
+    def _recycle_context(self):
+        """
+        Replaces the current browser context with a fresh one, keeping the session.
+
+        Playwright holds on to every request and response of a context until it is
+        closed, so long runs periodically swap the context to keep memory bounded. The
+        login session is carried over through the context's storage state.
+        """
+        storage_state = self.context.storage_state()
+        BrowserPool.release(self.context)
+        self._new_context(storage_state)
 
     def reload_page(self):
         """
@@ -88,42 +324,64 @@ class SIPDBot:
             return False
 
     @staticmethod
-    def is_cookies_exist(cookie_file="cookies.json") -> bool:
+    def is_state_exist(state_file=STATE_FILE) -> bool:
         """
-        Checks if the specified cookie file exists.
+        Checks if the specified session state file exists.
 
         Args:
-            cookie_file (str, optional): The name of the cookie file to check.
-            Defaults to "cookies.json".
+            state_file (str, optional): The name of the session state file to check.
+            Defaults to "state.json".
 
         Returns:
-            bool: True if the cookie file exists, False otherwise.
+            bool: True if the session state file exists, False otherwise.
         """
-        return os.path.exists(cookie_file)
+        return os.path.exists(state_file)
 
-    def save_cookies(self):
+    def save_state(self, path=STATE_FILE):
         """
-        Save current session cookies after a successful login attempt.
+        Save current session state after a successful login attempt.
+
+        The state holds the session cookies along with each origin's local storage, so
+        the whole login session can be restored later.
 
-        User need to manually fill the login and CAPTCHA form. After a successful login,
-        press Enter to continue and save the cookies.
+        Call this after a successful login, so the state belongs to an authenticated
+        session.
+
+        Args:
+            path (str, optional): The file to save the session state to. Defaults to
+            "state.json".
 
         Output:
-            cookies.json (file): A JSON file containing the session cookies.
+            state.json (file): A JSON file containing the session state.
         """
-        cookies = self.context.cookies()
-        with open("cookies.json", "w", encoding="utf-8") as f:
-            json.dump(cookies, f)
+        storage_state = self.context.storage_state()
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(storage_state))
 
     def login(self):
         """
-        Log in to SIPD-RI. Log in method is picked based on the existence of session cookie file.
+        Log in to SIPD-RI. Log in method is picked based on the existence of session state file.
+
+        Without a saved session the user has to log in manually, which is only possible
+        in debug mode where the browser window is visible.
+
+        Raises:
+            LoginRequired: If there is no saved session and the browser is headless.
         """
-        if self.is_cookies_exist():
-            self.login_with_cookies()
-        else:
+        if self.is_state_exist():
+            self.login_with_state()
+        elif self.debug:
             self.login_manual()
-            self.save_cookies()
+            self.save_state()
+        elif os.path.exists(self.LEGACY_COOKIE_FILE):
+            raise LoginRequired(
+                f"{self.LEGACY_COOKIE_FILE} is no longer used. Run 'Save session' from "
+                f"the menu once to save the session as {self.STATE_FILE}."
+            )
+        else:
+            raise LoginRequired(
+                "No saved session found. Run 'Save session' from the menu first."
+            )
 
     def login_manual(self):
         """
@@ -146,33 +404,39 @@ class SIPDBot:
         Log in to SIPD-RI using the provided credentials in the `.env` file
 
         This method navigates to the login page, enters the username and password,
-        and then selects the appropriate account. The user must manually complete the
-        CAPTCHA before proceeding.
+        and then selects the appropriate account. The CAPTCHA is passed to
+        `captcha_solver` if one is set, otherwise the user completes it manually.
 
         Args:
             username (str): The username to log in with.
             password (str): The password for the specified username.
 
         Raises:
+            LoginRequired: If the browser is headless and there is no `captcha_solver`,
+            since nobody could solve the CAPTCHA.
             PlaywrightTimeoutError: If any page elements fail to load within the
             timeout period.
 
         Notes:
-            - The CAPTCHA must be completed manually. Automation pauses to allow the
-              user to handle it.
+            - The login is considered done once the `Akuntansi` sidebar menu shows up,
+              waiting up to 5 minutes for the CAPTCHA to be solved.
             - A delay may be introduced for bad connections using a fail-safe.
         """
+        if not self.debug and not self.captcha_solver:
+            raise LoginRequired(
+                "The CAPTCHA needs a visible browser (debug=True) or a captcha_solver."
+            )
+
         # TODO: add fail-safe for bad connection
         self.page.goto(self.URL_LOGIN, timeout=120_000)
 
         # Login Form
         input_username = self.page.locator("#ed_username")
         input_username.wait_for(state="visible")
-        input_username.focus()
-        input_username.type(username)
+        input_username.fill(username)
         input_password = self.page.locator("#ed_password")
         input_password.wait_for()
-        input_password.type(password)
+        input_password.fill(password)
         input_password.press("Enter")
 
         # Account card
@@ -184,125 +448,385 @@ class SIPDBot:
         btn_account.click()
 
         # CAPTCHA form
-        self.page.bring_to_front()
-        input("Press Enter after successful login...")
+        if self.captcha_solver:
+            self.captcha_solver(self.page)
+        else:
+            self.page.bring_to_front()
+        self.page.wait_for_url("**/dashboard", timeout=300_000)
 
         # Sidebar - Akuntansi
         menu_link = self.page.locator('a:has-text("Akuntansi")').first
-        menu_link.wait_for(timeout=120_000)
+        menu_link.wait_for(state="visible", timeout=300_000)
 
-    def login_with_cookies(self):
+    def login_with_state(self):
         """
-        Log in to SIPD-RI using the previously saved session cookies. It will load
-        cookie file named `cookie.json`.
+        Log in to SIPD-RI using the previously saved session state. It will load the
+        session state file named `state.json`.
+
+        The current browser context is replaced by one created from the saved state, so
+        cookies and local storage are both in place before the first request. The session
+        is then checked by opening the login page, which redirects straight to the
+        dashboard for a valid session.
 
         Raises:
-            FileNotFoundError: If the `cookies.json` file does not exist.
-            json.JSONDecodeError: If the `cookies.json` file contains invalid JSON.
+            LoginRequired: If the saved session is invalid or expired and the browser is
+            headless.
+            PlaywrightTimeoutError: If the login page fails to load. The saved session is
+            kept, since a slow connection says nothing about it.
 
         Notes:
-            - The method assumes that the `cookies.json` file exists and contains valid cookies.
-            - If the cookies are expired or invalid, the session will not be authenticated
-              successfully.
-
+            - An invalid or expired `state.json` file is removed. In debug mode the user
+              is then asked to log in manually instead.
         """
         try:
-            with open("cookies.json", "r", encoding="utf-8") as f:
-                cookies = json.load(f)
-                self.context.add_cookies(cookies)
+            with open(self.STATE_FILE, "rb") as f:
+                storage_state = orjson.loads(f.read())
+        except orjson.JSONDecodeError:
+            self._discard_state("The saved session is invalid.")
+            return
 
-            self.page.goto(self.URL_LOGIN, timeout=120_000)
-            self.page.bring_to_front()
-            self.page.wait_for_url("**/dashboard", timeout=300_000)
+        BrowserPool.release(self.context)
+        self._new_context(storage_state)
 
-        except json.JSONDecodeError:
-            # For expired or invalid session cookie.
-            os.remove("cookies.json")
-            self.login()
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+        # Network errors and timeouts here propagate, leaving the saved session alone
+        self.page.goto(self.URL_LOGIN, timeout=120_000)
+
+        try:
+            self.page.wait_for_url("**/dashboard", timeout=self.SESSION_CHECK_TIMEOUT)
+        except PlaywrightTimeoutError:
+            # The login page loaded but never redirected, so the session is gone
+            self._discard_state("The saved session has expired.")
 
-    def download_realisasi(self, output_dir: str, start_month=1, end_month=1):
+    def _discard_state(self, reason: str):
         """
-        Downloads `Laporan Realisasi` for specified months from SIPD.
+        Removes an unusable `state.json` file and falls back to a fresh login.
 
         Args:
-            output_dir (str): The output directory where the file will be saved
-            start_month (int): The starting month (1-12).
-            end_month (int): The ending month (1-12).
+            reason (str): Why the saved session cannot be used, shown to the user.
 
-        Notes:
-            - Handles potential errors during navigation, element interaction, and downloads.
-            - Downloads reports for each month between `start_month` and `end_month`, inclusive.
-            - Ensures robust handling of unexpected issues, such as timeouts or invalid months.
+        Raises:
+            LoginRequired: If the browser is headless, since nobody could log in.
+        """
+        os.remove(self.STATE_FILE)
+        if not self.debug:
+            raise LoginRequired(
+                f"{reason} Run 'Save session' from the menu to log in again."
+            )
+        self.login()
+
+    def _select_all_skpd(self, page):
+        """
+        Picks `Unduh Semua SKPD` on the SKPD dropdown of a `Laporan Realisasi` tab.
+
+        Args:
+            page (Page): The `Laporan Realisasi` tab.
+        """
+        submenu_skpd = page.locator("div.css-j93siq input").first
+        submenu_skpd.wait_for()
+        submenu_skpd.fill("Unduh Semua SKPD")
+        submenu_skpd.press("Enter")
+
+    def _open_realisasi_page(self):
+        """
+        Opens a new tab on the `Laporan Realisasi` menu with every SKPD selected.
+
+        The month input and Download button locators are built once here and reused for
+        every month downloaded on this tab. A download listener is registered once as
+        well, queueing every download the tab receives.
+
+        Returns:
+            tuple: The prepared page, its month input locator, its Download button
+            locator, and its queue of received downloads.
+        """
+        page = self.context.new_page()
+        downloads = deque()
+        page.on("download", downloads.append)
+
+        page.goto(self.URL_REALISASI, wait_until="domcontentloaded")
+        menu_title = page.locator('h1:has-text("Laporan Realisasi")')
+        menu_title.wait_for()
+
+        # Download form - SKPD
+        self._select_all_skpd(page)
+
+        submenu_bulan = page.locator("div.css-j93siq input").nth(1)
+        btn_download = page.locator('button:has-text("Download")')
+
+        return page, submenu_bulan, btn_download, downloads
+
+    def _save_realisasi(
+        self, download_file, download_path: Path, month: int, end_month: int
+    ):
+        """
+        Saves a finished `Laporan Realisasi` download into the output directory.
+
+        The temporary download is renamed into place, which avoids copying the file. A copy
+        is only made when the temporary file sits on another filesystem.
+
+        Args:
+            download_file (Download): The finished download.
+            download_path (Path): The path the file will be saved as.
+            month (int): The month of the report.
+            end_month (int): The last month of the whole run, used for progress output.
 
         Raises:
-            Exception: If a critical error occurs during the process.
+            DownloadInterrupted: If the browser reports the download as failed.
         """
+        failure = download_file.failure()
+        if failure:
+            raise DownloadInterrupted(failure)
+
         try:
-            url = (
-                self.URL_PENATAUSAHAAN + "/penatausahaan/pengeluaran/laporan/realisasi"
+            os.replace(download_file.path(), download_path)
+        except OSError:
+            download_file.save_as(download_path)
+
+        logger.info(
+            "(%s/%s) --- Download success! File saved as %s",
+            month,
+            end_month,
+            download_path.name,
+        )
+
+    def _submit_month(self, tab: tuple, month: int):
+        """
+        Picks a month on the given tab and clicks Download, without waiting for the
+        download itself.
+
+        Args:
+            tab (tuple): A tab returned by `_open_realisasi_page`.
+            month (int): The month to download.
+        """
+        _, submenu_bulan, btn_download, downloads = tab
+
+        # Download form - Bulan
+        submenu_bulan.wait_for(timeout=60_000)
+        submenu_bulan.fill(_MONTHS[month - 1])
+        submenu_bulan.press("Enter")
+
+        # Drop late downloads of earlier attempts, so they are not taken for this month
+        downloads.clear()
+        btn_download.click()
+
+    def _reap_download(self, tab: tuple, timeout=120_000):
+        """
+        Takes the next download received by the given tab, waiting for it if needed.
+
+        Args:
+            tab (tuple): A tab returned by `_open_realisasi_page`.
+            timeout (int, optional): Maximum time to wait in milliseconds. Defaults to
+            120_000.
+
+        Returns:
+            Download: The received download.
+
+        Raises:
+            PlaywrightTimeoutError: If no download arrives in time.
+        """
+        page, _, _, downloads = tab
+
+        # The listener queues the awaited download too, so always take it from the queue
+        if not downloads:
+            page.wait_for_event("download", timeout=timeout)
+
+        return downloads.popleft()
+
+    def _download_month(
+        self, tab: tuple, download_path: Path, month: int, end_month: int
+    ):
+        """
+        Downloads `Laporan Realisasi` for a single month on the given tab.
+
+        Args:
+            tab (tuple): A tab returned by `_open_realisasi_page`.
+            download_path (Path): The path the file will be saved as.
+            month (int): The month to download.
+            end_month (int): The last month of the whole run, used for progress output.
+        """
+        self._submit_month(tab, month)
+        download_file = self._reap_download(tab)
+        self._save_realisasi(download_file, download_path, month, end_month)
+
+    def _retry_month(self, tab: tuple, download_path: Path, month: int, end_month: int):
+        """
+        Retries a failed month with exponential backoff, reloading the tab before every
+        attempt.
+
+        Args:
+            tab (tuple): A tab returned by `_open_realisasi_page`.
+            download_path (Path): The path the file will be saved as.
+            month (int): The month to download.
+            end_month (int): The last month of the whole run, used for progress output.
+
+        Raises:
+            DownloadFailed: If every attempt fails.
+        """
+        page = tab[0]
+
+        for attempt in range(self.DOWNLOAD_RETRIES):
+            time.sleep(2**attempt)
+            logger.info(
+                "(%s/%s) --- Retrying (%s/%s)...",
+                month,
+                end_month,
+                attempt + 1,
+                self.DOWNLOAD_RETRIES,
             )
-            self.page.goto(url)
-            menu_title = self.page.locator('h1:has-text("Laporan Realisasi")')
-            menu_title.wait_for()
 
-            # Download form - SKPD
-            submenu_skpd = self.page.locator("div.css-j93siq input").first
-            submenu_skpd.wait_for()
-            submenu_skpd.click()
-            submenu_skpd.type("Unduh Semua SKPD")
-            submenu_skpd.press("Enter")
+            try:
+                page.reload(wait_until="domcontentloaded")
+                self._select_all_skpd(page)
+                self._download_month(tab, download_path, month, end_month)
+                return
 
-            for i in range(start_month, end_month + 1):
-                print(f"({i}/{end_month}) --- Downloading file...")
+            except Exception as e:
+                if not _is_retriable(e):
+                    logger.exception("(%s/%s) --- Unexpected error", month, end_month)
+                    raise _DownloadAborted() from e
+                logger.error("(%s/%s) --- Download failed: %s", month, end_month, e)
 
-                try:
-                    # Download form - Bulan
-                    submenu_bulan = self.page.locator("div.css-j93siq input").nth(1)
-                    submenu_bulan.wait_for(timeout=60_000)
-                    submenu_bulan.click()
-                    submenu_bulan.type(get_month_name(i))
-                    submenu_bulan.press("Enter")
-
-                    try:
-                        with self.page.expect_download(
-                            timeout=120_000
-                        ) as download_info:
-                            btn_download = self.page.locator(
-                                'button:has-text("Download")'
-                            )
-                            btn_download.click()
+        raise DownloadFailed(
+            f"Gave up on month {month} after {self.DOWNLOAD_RETRIES} retries."
+        )
+
+    def _download_realisasi_batch(
+        self, download_paths: dict, end_month: int, batch: list
+    ):
+        """
+        Downloads `Laporan Realisasi` for a batch of months, one month per tab.
 
-                        download_name = f"2024-{i:02d}-Laporan Realisasi.xlsx"
-                        download_path = f"{output_dir}/{download_name}"
+        Every Download button is clicked first, then all downloads are awaited together,
+        so the server-side report generation of each month overlaps with the others.
+        Months that fail with a retriable error are then retried one by one, any other
+        error is logged and raised.
 
-                        download_file = download_info.value
-                        download_file.save_as(download_path)
+        Args:
+            download_paths (dict): The path each month will be saved as.
+            end_month (int): The last month of the whole run, used for progress output.
+            batch (list): A list of `(tab, month)` pairs, where `tab` is a tuple returned by
+            `_open_realisasi_page`.
 
-                        print(
-                            f"({i}/{end_month}) --- Download success! File saved as {download_name}"
-                        )
+        Returns:
+            list: The months that could not be downloaded.
+        """
+        submitted = []
+        retries = []
+        failed = []
+
+        # Submit - pick the month and click Download on every tab
+        for tab, month in batch:
+            logger.info("(%s/%s) --- Downloading file...", month, end_month)
+
+            try:
+                self._submit_month(tab, month)
+                submitted.append((tab, month))
+            except Exception as e:
+                if not _is_retriable(e):
+                    logger.exception("(%s/%s) --- Unexpected error", month, end_month)
+                    raise _DownloadAborted() from e
+                logger.error("(%s/%s) --- Download failed: %s", month, end_month, e)
+                retries.append((tab, month))
+
+        # Reap - save every download as it arrives
+        for tab, month in submitted:
+            try:
+                download_file = self._reap_download(tab)
+                self._save_realisasi(
+                    download_file, download_paths[month], month, end_month
+                )
+            except Exception as e:
+                if not _is_retriable(e):
+                    logger.exception("(%s/%s) --- Unexpected error", month, end_month)
+                    raise _DownloadAborted() from e
+                logger.error("(%s/%s) --- Download failed: %s", month, end_month, e)
+                retries.append((tab, month))
+
+        for tab, month in retries:
+            try:
+                self._retry_month(tab, download_paths[month], month, end_month)
+            except DownloadFailed as e:
+                logger.error("(%s/%s) --- %s", month, end_month, e)
+                failed.append(month)
+
+        return failed
+
+    def download_realisasi(
+        self, output_dir: str, start_month=1, end_month=1, year=None
+    ) -> list:
+        """
+        Downloads `Laporan Realisasi` for specified months from SIPD.
 
-                    except PlaywrightTimeoutError as e:
-                        print(f"({i}/{end_month}) --- Download failed: {e}")
-                        print("Retrying...")
-                        # TODO: Retry logic for failed downloads.
+        Args:
+            output_dir (str): The output directory where the file will be saved
+            start_month (int): The starting month (1-12).
+            end_month (int): The ending month (1-12).
+            year (int, optional): The fiscal year used in the file names. Defaults to
+            the current year.
 
-                except IndexError:  # Catching month values > 12
-                    print(
-                        f"({i}/{end_month}) --- Invalid month! There are only 12 months."
-                    )
+        Returns:
+            list: The months that could not be downloaded, so they can be requested
+            again.
 
-                except Exception as e:
-                    print(f"({i}/{end_month}) --- Unexpected error: {e}")
-                    print("Skipping to the next month.")
+        Notes:
+            - Up to `DOWNLOAD_CONCURRENCY` months are downloaded at once, each in its own tab
+              of the same browser context.
+            - A month failing on a timeout, network error or interrupted download is
+              retried up to `DOWNLOAD_RETRIES` times with exponential backoff before it
+              is given up on.
+              Any other error stops the run, and the months left are returned as failed.
+            - The browser context is recycled every `CONTEXT_RECYCLE_BATCHES` batches to
+              keep memory usage bounded on long runs.
+            - Downloads reports for each month between `start_month` and `end_month`, inclusive.
+            - Ensures robust handling of unexpected issues, such as timeouts.
+
+        Raises:
+            ValueError: If the months are not within 1-12 or `start_month` is after
+            `end_month`.
+        """
+        validate_month_range(start_month, end_month)
+
+        if year is None:
+            year = datetime.now().year
 
-        except PlaywrightTimeoutError as e:
-            print(f"Page load timed out: {e}")
+        months = list(range(start_month, end_month + 1))
+
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        download_paths = {
+            month: output_path / f"{year}-{month:02d}-Laporan Realisasi.xlsx"
+            for month in months
+        }
+        failed = []
+        tabs = []
+        i = 0
+
+        try:
+            tab_count = min(len(months), self.DOWNLOAD_CONCURRENCY)
+            tabs = [self._open_realisasi_page() for _ in range(tab_count)]
+            batch_count = 0
+
+            for i in range(0, len(months), tab_count):
+                if batch_count >= self.CONTEXT_RECYCLE_BATCHES:
+                    self._recycle_context()
+                    tabs = [self._open_realisasi_page() for _ in range(tab_count)]
+                    batch_count = 0
+
+                batch = list(zip(tabs, months[i : i + tab_count]))
+                failed += self._download_realisasi_batch(
+                    download_paths, end_month, batch
+                )
+                batch_count += 1
 
         except Exception as e:
-            print(f"Critical error occurred: {e}")
+            if not isinstance(e, _DownloadAborted):
+                logger.exception("Critical error occurred, stopping the download")
+            failed += [m for m in months[i:] if not download_paths[m].exists()]
+
+        finally:
+            for page, *_ in tabs:
+                page.close()
+
+        return failed
 
     def posting_jurnal_belanja(self):
         """
@@ -332,8 +856,8 @@ class SIPDBot:
             submenu_belanja.click()
 
             # Delay for user input
-            print(">>>>>>>>>>> Posting Jurnal Belanja Start")
-            input("Press Enter to continue...")
+            logger.info(">>>>>>>>>>> Posting Jurnal Belanja Start")
+            prompt("Press Enter to continue...")
 
             # Dropdown - Status
             dropdown_status = self.page.locator("#vs5__combobox input")
@@ -357,9 +881,9 @@ class SIPDBot:
             input_filter = self.page.locator("input[data-v-01f535b6]").first
             btn_terapkan = self.page.locator('button:has-text("Terapkan")')
 
-            print(">>>>>>>>>>>> Metode Beban Start")
+            logger.info(">>>>>>>>>>>> Metode Beban Start")
             for jurnal in metode_beban:
-                print(f"Metode Beban: {jurnal}\n")
+                logger.info("Metode Beban: %s", jurnal)
 
                 # Filter - Input
                 input_filter.wait_for()
@@ -371,9 +895,9 @@ class SIPDBot:
                 btn_terapkan.wait_for()
                 btn_terapkan.click()
 
-                input("Press Enter to continue...")
+                prompt("Press Enter to continue...")
 
-            print(">>>>>>>>>>>> Metode Aset Start")
+            logger.info(">>>>>>>>>>>> Metode Aset Start")
             # Filter - Input
             input_filter.wait_for()
             input_filter.click()
@@ -384,14 +908,14 @@ class SIPDBot:
             btn_terapkan.wait_for()
             btn_terapkan.click()
 
-            input("Press Enter to continue...")
+            prompt("Press Enter to continue...")
 
-            print("Done iterating")
-            input("Press Enter to continue...")
+            logger.info("Done iterating")
+            prompt("Press Enter to continue...")
 
         except Exception as e:
-            input("Press enter to show error")
-            print(e)
+            prompt("Press enter to show error")
+            logger.error("%s", e)
 
     def input_jurnal_umum(self, jurnal_umum: list):
         """
@@ -442,8 +966,8 @@ class SIPDBot:
             submenu_jurnal_umum.click()
 
             # Delay for user input
-            print(">>>>>> Input jurnal mulai")
-            input("Press Enter to continue...")
+            logger.info(">>>>>> Input jurnal mulai")
+            prompt("Press Enter to continue...")
 
             for i in jurnal_umum:
                 kode_rekening = str(i[0])
@@ -484,22 +1008,22 @@ class SIPDBot:
                 btn_tambah = self.page.locator(f'{tambah_id} button:has-text("Tambah")')
                 btn_tambah.click()
 
-            input("End input jurnal>>>>")
+            prompt("End input jurnal>>>>")
 
         except Exception as e:
-            print(e)
+            logger.error("%s", e)
 
     def table_scrape(self):
-        print("This is table scraping")
+        logger.info("This is table scraping")
 
         self.page.goto(
             "https://sipd.kemendagri.go.id/penatausahaan/pengeluaran/bku/skpd"
         )
-        input("Press Enter to scrape table...")
+        prompt("Press Enter to scrape table...")
 
         tables = self.page.query_selector_all("table")
         if not tables:
-            print("No tables found on this page.")
+            logger.warning("No tables found on this page.")
             return
 
         for i, table in enumerate(tables):
@@ -512,7 +1036,7 @@ class SIPDBot:
         df = pd.DataFrame(table_data[1:], columns=table_data[0])
         output_file = "sample-table.xlsx"
         df.to_excel(output_file, index=False)
-        print(f"Tables is saved in {output_file}.")
+        logger.info("Tables is saved in %s.", output_file)
 
     def download_neraca(self, output_dir: str, skpd_list: list):
         """
@@ -542,7 +1066,7 @@ class SIPDBot:
 
             # Iterate SKPD start
             for skpd in skpd_list:
-                print(f"Download start   - {skpd}")
+                logger.info("Download start   - %s", skpd)
 
                 # Dropdown - Pilih SKPD
                 id_skpd = "__BVID__111"
@@ -593,15 +1117,14 @@ class SIPDBot:
                 download_file = download_info.value
                 download_file.save_as(download_path)
 
-                print(f"Download success - {skpd}")
-                print()
+                logger.info("Download success - %s", skpd)
 
                 # TODO: add retry logic for failed downloads
 
-            input(">>>>>>>>>>>>>>>>>>>>> Sample end")
+            prompt(">>>>>>>>>>>>>>>>>>>>> Sample end")
 
         except Exception as e:
-            print(f"Critical error occurred: {e}")
+            logger.error("Critical error occurred: %s", e)
 
     def download_lra(self, output_dir: str, skpd_list: list):
         """
@@ -631,7 +1154,7 @@ class SIPDBot:
 
             # Iterate SKPD start
             for skpd in skpd_list:
-                print(f"Download start   - {skpd}")
+                logger.info("Download start   - %s", skpd)
 
                 # Dropdown - Pilih SKPD
                 id_skpd = "__BVID__111"
@@ -682,15 +1205,14 @@ class SIPDBot:
                 download_file = download_info.value
                 download_file.save_as(download_path)
 
-                print(f"Download success - {skpd}")
-                print()
+                logger.info("Download success - %s", skpd)
 
                 # TODO: add retry logic for failed downloads
 
-            input(">>>>>>>>>>>>>>>>>>>>> Sample end")
+            prompt(">>>>>>>>>>>>>>>>>>>>> Sample end")
 
         except Exception as e:
-            print(f"Critical error occurred: {e}")
+            logger.error("Critical error occurred: %s", e)
 
     def download_lo(self, output_dir: str, skpd_list: list):
         """
@@ -720,7 +1242,7 @@ class SIPDBot:
 
             # Iterate SKPD start
             for skpd in skpd_list:
-                print(f"Download start   - {skpd}")
+                logger.info("Download start   - %s", skpd)
 
                 # Dropdown - Pilih SKPD
                 id_skpd = "__BVID__111"
@@ -771,15 +1293,14 @@ class SIPDBot:
                 download_file = download_info.value
                 download_file.save_as(download_path)
 
-                print(f"Download success - {skpd}")
-                print()
+                logger.info("Download success - %s", skpd)
 
                 # TODO: add retry logic for failed downloads
 
-            input(">>>>>>>>>>>>>>>>>>>>> Sample end")
+            prompt(">>>>>>>>>>>>>>>>>>>>> Sample end")
 
         except Exception as e:
-            print(f"Critical error occurred: {e}")
+            logger.error("Critical error occurred: %s", e)
 
     def download_lpe(self, output_dir: str, skpd_list: list):
         """
@@ -809,7 +1330,7 @@ class SIPDBot:
 
             # Iterate SKPD start
             for skpd in skpd_list:
-                print(f"Download start   - {skpd}")
+                logger.info("Download start   - %s", skpd)
 
                 # Dropdown - Pilih SKPD
                 id_skpd = "__BVID__111"
@@ -858,15 +1379,14 @@ class SIPDBot:
                 download_file = download_info.value
                 download_file.save_as(download_path)
 
-                print(f"Download success - {skpd}")
-                print()
+                logger.info("Download success - %s", skpd)
 
                 # TODO: add retry logic for failed downloads
 
-            input(">>>>>>>>>>>>>>>>>>>>> Sample end")
+            prompt(">>>>>>>>>>>>>>>>>>>>> Sample end")
 
         except Exception as e:
-            print(f"Critical error occurred: {e}")
+            logger.error("Critical error occurred: %s", e)
 
     def download_buku_jurnal(self, output_dir: str, skpd_list: list):
         """
@@ -890,7 +1410,7 @@ class SIPDBot:
 
             # Iterate SKPD start
             for skpd in skpd_list:
-                print(f"\nDownload start   - {skpd}")
+                logger.info("Download start   - %s", skpd)
 
                 # Dropdown - Pilih SKPD
                 title_skpd = self.page.locator('div:has-text("SKPD")')
@@ -955,7 +1475,7 @@ class SIPDBot:
                             )
                             error_popup.wait_for(state="visible", timeout=10_000)
 
-                            print("Gagal Cetak!")
+                            logger.error("Gagal Cetak!")
 
                             error_button = self.page.locator(
                                 'button:has-text("OK")'
@@ -973,10 +1493,10 @@ class SIPDBot:
                     download_file = download_info.value
                     download_file.save_as(download_path)
 
-                    print(f"Download success - {skpd}")
+                    logger.info("Download success - %s", skpd)
 
                 except PlaywrightTimeoutError as e:
-                    print(f"Download error for {skpd}: {e}")
+                    logger.error("Download error for %s: %s", skpd, e)
                     self.page.reload()
 
                     while self.is_404():
@@ -988,14 +1508,14 @@ class SIPDBot:
                 except Exception as e:
                     # TODO: there are some SKPD that can't be downloaded using "Semua Transaksi"
                     #       A pop-up that says "Gagal Cetak" will show up.
-                    print(f"Download error: {e}")
+                    logger.error("Download error: %s", e)
                     self.page.reload()
 
                     while self.is_404():
                         time.sleep(2)
                         self.page.reload()
 
-            input(">>>>>>>>>>>>>>>>>>>>> Sample end")
+            prompt(">>>>>>>>>>>>>>>>>>>>> Sample end")
 
         except Exception as e:
-            print(f"Critical error occurred: {e}")
+            logger.error("Critical error occurred: %s", e)
@@ -14,31 +14,41 @@ from rich.traceback import Traceback
 
 from src.bot_sipd import SIPDBot
 from src.helper_excel import ExcelHelper
-from src.utils import select_excel_file, select_excel_files, get_current_date
+from src.utils import (
+    select_excel_file,
+    select_excel_files,
+    get_current_date,
+    validate_month_range,
+    wait_for_logs,
+)
 
 
-def save_cookies():
+def save_session():
     with Progress() as progress:
-        task = progress.add_task("[green]Saving cookies...", total=100)
+        task = progress.add_task("[green]Saving session...", total=100)
 
-        progress.update(task, advance=20, description="Checking cookie existence")
-        if SIPDBot.is_cookies_exist():
-            os.remove("cookies.json")
-            progress.update(task, advance=20, description="Removing old cookies")
+        progress.update(task, advance=20, description="Checking saved session")
+        if SIPDBot.is_state_exist():
+            os.remove(SIPDBot.STATE_FILE)
+            progress.update(task, advance=20, description="Removing old session")
         else:
-            progress.update(task, advance=20, description="Cookie not found")
+            progress.update(task, advance=20, description="Saved session not found")
+
+        # Session file of older versions, replaced by the one saved below
+        if os.path.exists(SIPDBot.LEGACY_COOKIE_FILE):
+            os.remove(SIPDBot.LEGACY_COOKIE_FILE)
 
         progress.update(task, advance=20, description="Logging in")
-        with SIPDBot() as bot:
+        with SIPDBot(debug=True) as bot:
             bot.login()
-        progress.update(task, advance=40, description="Cookie saved!")
+        progress.update(task, advance=40, description="Session saved!")
 
 
 # ---------- a2 - beta success
 def input_jurnal_umum(file_path):
     jurnal_umum = ExcelHelper.read_jurnal_umum(file_path)
 
-    with SIPDBot() as bot:
+    with SIPDBot(debug=True) as bot:
         bot.login()
         bot.input_jurnal_umum(jurnal_umum)
 
@@ -118,12 +128,23 @@ def download_buku_jurnal():
 
 # ---------- b1
 def download_laporan_realisasi(start_month, end_month):
+    # Fail on a mistyped month before paying for the browser launch and login
+    validate_month_range(start_month, end_month)
+
     today = get_current_date()
     output_dir = f"Laporan Realisasi {today}"
 
     with SIPDBot() as bot:
         bot.login()
-        bot.download_realisasi(output_dir, start_month, end_month)
+        failed_months = bot.download_realisasi(output_dir, start_month, end_month)
+
+    if failed_months:
+        wait_for_logs()
+        console = Console()
+        console.print(
+            "> :warning:  [red]Failed months:[/red] "
+            + ", ".join(str(month) for month in failed_months)
+        )
 
 
 # ---------- Displayed Menu functions -----------------------------------------
@@ -139,6 +160,7 @@ def menu_return():
     """
     Print out user input to halt current process.
     """
+    wait_for_logs()
     console = Console()
     console.print("\n> Press Enter to continue...", style="dim")
     input()
@@ -182,7 +204,7 @@ def menu_table():
 
     # Common Menu
     table.add_row("0", "Exit")
-    table.add_row("1", "Save cookies [dim](Please refresh cookies everyday!)[/dim]")
+    table.add_row("1", "Save session [dim](Please refresh session everyday!)[/dim]")
     table.add_row()
 
     # Akuntansi
@@ -226,11 +248,11 @@ def run_app():
 
             choice = input("\n> ")
 
-            # 1 - Save Cookies
+            # 1 - Save Session
             if choice == "1":
                 menu_clear()
                 menu_title()
-                save_cookies()
+                save_session()
 
             # a1 - Posting Jurnal
             elif choice == "a1":
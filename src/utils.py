@@ -3,12 +3,85 @@ Utility module for date, time, and file path operations.
 Provides common operations with getters.
 """
 
+import copy
+import logging
 import os
+import queue
 import tkinter as tk
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from tkinter import filedialog
 
+from rich.logging import RichHandler
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    A `QueueHandler` that keeps records intact for a listener in the same process.
+
+    The stock handler formats each record into its message and drops the traceback, so
+    the listener's handler could no longer format or render them itself.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_log_queue = None
+
+
+def setup_logging(level=logging.INFO) -> QueueListener:
+    """
+    Routes every log record through a queue to a background thread that writes it out.
+
+    Log calls only enqueue the record, so the bot never blocks on writing to the
+    console while it is driving the browser.
+
+    Args:
+        level (int, optional): The root logger level. Defaults to `logging.INFO`.
+
+    Returns:
+        QueueListener: The started listener. Call `stop()` on exit to flush pending
+        records.
+    """
+    global _log_queue
+    _log_queue = queue.Queue(-1)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_LocalQueueHandler(_log_queue))
+
+    listener = QueueListener(_log_queue, RichHandler(show_path=False))
+    listener.start()
+    return listener
+
+
+def wait_for_logs():
+    """
+    Blocks until every queued log record has been written out, so console output that
+    follows does not interleave with pending log lines.
+    """
+    if _log_queue is not None:
+        _log_queue.join()
+
+
+def prompt(message="") -> str:
+    """
+    Asks the user for input once all pending log records have been written out.
+
+    Args:
+        message (str, optional): The prompt shown to the user. Defaults to "".
+
+    Returns:
+        str: The line entered by the user.
+    """
+    wait_for_logs()
+    return input(message)
+
 
 def select_excel_file() -> str:
     """
@@ -71,6 +144,24 @@ def get_month_name(index) -> str:
         return None
 
 
+def validate_month_range(start_month: int, end_month: int):
+    """
+    Checks that a month range lies within 1-12 and is in order.
+
+    Args:
+        start_month (int): The starting month (1-12).
+        end_month (int): The ending month (1-12).
+
+    Raises:
+        ValueError: If the months are not within 1-12 or `start_month` is after
+        `end_month`.
+    """
+    if not 1 <= start_month <= end_month <= 12:
+        raise ValueError(
+            f"Invalid month range {start_month}-{end_month}, expected 1-12."
+        )
+
+
 def get_current_time() -> str:
     """
     Get the current time in HH:MM:SS format.